@@ -1,11 +1,16 @@
 import java.io.*;
+import java.lang.foreign.Arena;
+import java.lang.foreign.MemorySegment;
+import java.nio.channels.FileChannel;
 import java.nio.charset.StandardCharsets;
 import java.nio.file.*;
 import java.time.Instant;
 import java.time.ZoneOffset;
 import java.time.format.DateTimeFormatter;
 import java.util.*;
-import java.util.stream.Collectors;
+import java.util.concurrent.*;
+
+import static java.lang.foreign.ValueLayout.JAVA_BYTE;
 
 /**
  * Summarize JMeter CSV results, compare to moving average baseline, update history and badge.
@@ -42,22 +47,52 @@ public class SummarizeAndCompare {
     static final String BRANCH = System.getenv().getOrDefault("GITHUB_REF_NAME", "");
     static final String NOW_ISO = DateTimeFormatter.ofPattern("yyyy-MM-dd'T'HH:mm:ss'Z'")
             .withZone(ZoneOffset.UTC).format(Instant.now());
+    // Run-level columns shared by every history row of this run
+    static final String HISTORY_ROW_PREFIX = String.join(",", NOW_ISO, RUN_NUMBER, SHA, BRANCH) + ",";
 
     // Thresholds
     static final double WARN_PCT = 5.0;
     static final double ALERT_PCT = 10.0;
     static final double BLOCK_PCT = 20.0;
 
+    // Status levels ordered by severity; the ordinal indexes the name and badge tables
+    static final int GREEN = 0, YELLOW = 1, RED = 2;
+    static final String[] LEVEL_NAMES = {"green", "yellow", "red"};
+    static final String[] BADGE_COLORS = {"#4c1", "#dfb317", "#e05d44"};
+    static final String[] BADGE_TEXTS = {"OK", "WARN", "ALERT"};
+
+    // Regression bands for the p95 delta: band i applies once delta exceeds DELTA_BOUNDS[i - 1]
+    static final double[] DELTA_BOUNDS = {WARN_PCT, ALERT_PCT, BLOCK_PCT};
+    static final int[] BAND_LEVELS = {GREEN, YELLOW, RED, RED};
+    static final String[] BAND_EMOJIS = {"✅", "🟡", "🔴", "🛑"};
+    static final String[] BAND_NOTES = {"OK", "YELLOW (>5%)", "RED (>10%)", "BLOCK (>20%)"};
+    static final int BLOCK_BAND = 3;
+
+    // Column positions in JMeter's default CSV layout (timeStamp,elapsed,label,responseCode,responseMessage,
+    // threadName,dataType,success,...), used when results were saved without a header row
+    static final int DEFAULT_ELAPSED_IDX = 1;
+    static final int DEFAULT_LABEL_IDX = 2;
+    static final int DEFAULT_SUCCESS_IDX = 7;
+
+    // Number of most recent history runs averaged into the p95 baseline
+    static final int BASELINE_WINDOW = 10;
+
+    // Row templates for the summary tables (cells are pre-formatted strings)
+    static final String MD_SCENARIO_ROW = "| %s | %s | %s | %s | %s | %s | %s %s |\n";
+    static final String HTML_SCENARIO_ROW = "<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s %s</td></tr>\n";
+    static final String MD_ENDPOINT_ROW = "| %s | %s | %s | %d | %s |\n";
+    static final String HTML_ENDPOINT_ROW = "<tr><td>%s</td><td>%s</td><td>%s</td><td>%d</td><td>%s</td></tr>\n";
+
     public static void main(String[] args) throws Exception {
         ensureDirs();
 
-        List<Path> csvFiles;
+        List<Path> csvFiles = new ArrayList<>();
         if (Files.isDirectory(RESULTS_DIR)) {
-            try (var s = Files.list(RESULTS_DIR)) {
-                csvFiles = s.filter(p -> p.toString().endsWith(".csv")).sorted().collect(Collectors.toList());
+            // Glob is matched against the file name during the directory scan
+            try (DirectoryStream<Path> ds = Files.newDirectoryStream(RESULTS_DIR, "*.csv")) {
+                ds.forEach(csvFiles::add);
             }
-        } else {
-            csvFiles = List.of();
+            Collections.sort(csvFiles);
         }
 
         if (csvFiles.isEmpty()) {
@@ -67,23 +102,33 @@ public class SummarizeAndCompare {
 
         Map<String, Agg> scenarios = new LinkedHashMap<>();
         // Collect per-endpoint samples across all CSVs
-        Map<String, List<Sample>> endpointSamples = new LinkedHashMap<>();
-        for (Path p : csvFiles) {
-            String raw = stripExtension(p.getFileName().toString());
-            String name = friendlyScenarioName(raw);
-            List<Sample> samples = readJMeterCsv(p);
-            // Merge endpoint samples
-            for (Sample s : samples) {
-                endpointSamples.computeIfAbsent(s.label, k -> new ArrayList<>()).add(s);
+        Map<String, Samples> endpointSamples = new LinkedHashMap<>();
+        // CSVs are independent, so parse them in parallel; results are consumed in file order to keep output stable
+        int workers = Math.max(1, Math.min(csvFiles.size(), Runtime.getRuntime().availableProcessors()));
+        try (ExecutorService pool = Executors.newFixedThreadPool(workers)) {
+            List<Future<ParsedCsv>> parsed = new ArrayList<>();
+            for (Path p : csvFiles) {
+                parsed.add(pool.submit(() -> {
+                    Map<String, Samples> endpoints = new LinkedHashMap<>();
+                    Samples samples = readJMeterCsv(p, endpoints);
+                    return new ParsedCsv(samples, endpoints);
+                }));
             }
-            Agg agg = aggregate(samples);
-            // Only keep non-empty scenarios
-            if (!Double.isNaN(agg.p95_ms)) {
-                scenarios.put(name, agg);
+            for (int i = 0; i < csvFiles.size(); i++) {
+                String raw = stripExtension(csvFiles.get(i).getFileName().toString());
+                String name = friendlyScenarioName(raw);
+                ParsedCsv pc = parsed.get(i).get();
+                // Merge endpoint samples
+                pc.endpoints().forEach((label, s) -> endpointSamples.merge(label, s, Samples::addAll));
+                Agg agg = aggregate(pc.samples());
+                // Only keep non-empty scenarios
+                if (!Double.isNaN(agg.p95_ms)) {
+                    scenarios.put(name, agg);
+                }
             }
         }
 
-        List<HistRow> history = readHistory();
+        Map<String, Double> baselines = readBaselines(BASELINE_WINDOW);
 
         StringBuilder md = new StringBuilder();
         md.append("# GrepWise Performance Summary\n");
@@ -100,7 +145,7 @@ public class SummarizeAndCompare {
         html.append("<h2>Scenarios</h2>\n");
         html.append("<table><thead><tr><th>Scenario</th><th>p95 (ms)</th><th>Δ vs avg</th><th>Avg (ms)</th><th>Throughput (req/s)</th><th>Errors (%)</th><th>Status</th></tr></thead><tbody>\n");
 
-        String worstLevel = "green";
+        int worstLevel = GREEN;
         Map<String, Object> json = new LinkedHashMap<>();
         json.put("generatedAt", NOW_ISO);
         json.put("run", RUN_NUMBER);
@@ -117,34 +162,27 @@ public class SummarizeAndCompare {
         for (var entry : scenarios.entrySet()) {
             String name = entry.getKey();
             Agg agg = entry.getValue();
-            List<Double> histP95 = history.stream()
-                    .filter(h -> name.equals(h.scenario) && !Double.isNaN(h.p95_ms) && h.p95_ms > 0)
-                    .map(h -> h.p95_ms)
-                    .collect(Collectors.toList());
-            double baseline = movingAverage(histP95, 10);
+            double baseline = baselines.getOrDefault(name, Double.NaN);
             double curP95 = agg.p95_ms;
-            double delta = Double.NaN;
-            String level = "green";
-            String emoji = "✅";
-            String note = "";
+            // NaN propagates: a missing baseline (NaN or 0) or missing p95 yields a NaN delta
+            double delta = baseline > 0 ? ((curP95 - baseline) / baseline) * 100.0 : Double.NaN;
+            int level = GREEN;
+            String emoji = BAND_EMOJIS[0];
+            String note;
 
-            boolean hasData = !Double.isNaN(curP95);
-            if (!hasData) {
+            if (Double.isNaN(curP95)) {
                 note = "no data";
-            } else if (!Double.isNaN(baseline) && baseline > 0) {
-                delta = ((curP95 - baseline) / baseline) * 100.0;
-                if (delta > BLOCK_PCT) {
-                    level = "red"; emoji = "🛑"; note = "BLOCK (>20%)"; shouldBlock = true;
-                } else if (delta > ALERT_PCT) {
-                    level = "red"; emoji = "🔴"; note = "RED (>10%)";
-                } else if (delta > WARN_PCT) {
-                    level = "yellow"; emoji = "🟡"; note = "YELLOW (>5%)";
-                } else { level = "green"; emoji = "✅"; note = "OK"; }
-            } else {
+            } else if (Double.isNaN(delta)) {
                 note = "no baseline";
+            } else {
+                int band = deltaBand(delta);
+                level = BAND_LEVELS[band];
+                emoji = BAND_EMOJIS[band];
+                note = BAND_NOTES[band];
+                if (band == BLOCK_BAND) shouldBlock = true;
             }
 
-            worstLevel = worseOf(worstLevel, level);
+            worstLevel = Math.max(worstLevel, level);
 
             Map<String, Object> js = new LinkedHashMap<>();
             js.put("avg_ms", numOrNull(agg.avg_ms));
@@ -155,30 +193,23 @@ public class SummarizeAndCompare {
             js.put("errors", agg.errors);
             js.put("baseline_p95_ms", numOrNull(baseline));
             js.put("delta_pct_vs_baseline_p95", numOrNull(delta));
-            js.put("level", level);
+            js.put("level", LEVEL_NAMES[level]);
             js.put("note", note);
             jsonScenarios.put(name, js);
 
-            md.append(String.format(Locale.US,
-                    "| %s | %s | %s | %s | %s | %s | %s %s |\n",
-                    name,
-                    fmtNum(agg.p95_ms, "%.1f"),
-                    fmtNum(delta, "%.1f%%"),
-                    fmtNum(agg.avg_ms, "%.1f"),
-                    fmtNum(agg.throughput, "%.2f"),
-                    fmtNum(agg.err_rate, "%.2f"),
-                    emoji, note));
+            // Format the cells once and share them between the Markdown and HTML rows
+            String p95Cell = fmtNum(agg.p95_ms, "%.1f");
+            String deltaCell = fmtNum(delta, "%.1f%%");
+            String avgCell = fmtNum(agg.avg_ms, "%.1f");
+            String tputCell = fmtNum(agg.throughput, "%.2f");
+            String errCell = fmtNum(agg.err_rate, "%.2f");
+            md.append(String.format(Locale.US, MD_SCENARIO_ROW,
+                    name, p95Cell, deltaCell, avgCell, tputCell, errCell, emoji, note));
 
             // Also add HTML row
-            html.append(String.format(Locale.US,
-                    "<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s %s</td></tr>\n",
-                    escapeHtml(name),
-                    escapeHtml(fmtNum(agg.p95_ms, "%.1f")),
-                    escapeHtml(fmtNum(delta, "%.1f%%")),
-                    escapeHtml(fmtNum(agg.avg_ms, "%.1f")),
-                    escapeHtml(fmtNum(agg.throughput, "%.2f")),
-                    escapeHtml(fmtNum(agg.err_rate, "%.2f")),
-                    emoji, escapeHtml(note)));
+            html.append(String.format(Locale.US, HTML_SCENARIO_ROW,
+                    escapeHtml(name), escapeHtml(p95Cell), escapeHtml(deltaCell), escapeHtml(avgCell),
+                    escapeHtml(tputCell), escapeHtml(errCell), emoji, escapeHtml(note)));
         }
 
         // Close scenarios table in HTML
@@ -210,18 +241,12 @@ public class SummarizeAndCompare {
         for (var e : endpointList) {
             String label = e.getKey();
             Agg a = e.getValue();
-            md.append(String.format(Locale.US, "| %s | %s | %s | %d | %s |\n",
-                    label,
-                    fmtNum(a.avg_ms, "%.1f"),
-                    fmtNum(a.p95_ms, "%.1f"),
-                    a.count,
-                    fmtNum(a.err_rate, "%.2f")));
-            html.append(String.format(Locale.US, "<tr><td>%s</td><td>%s</td><td>%s</td><td>%d</td><td>%s</td></tr>\n",
-                    escapeHtml(label),
-                    escapeHtml(fmtNum(a.avg_ms, "%.1f")),
-                    escapeHtml(fmtNum(a.p95_ms, "%.1f")),
-                    a.count,
-                    escapeHtml(fmtNum(a.err_rate, "%.2f"))));
+            String avgCell = fmtNum(a.avg_ms, "%.1f");
+            String p95Cell = fmtNum(a.p95_ms, "%.1f");
+            String errCell = fmtNum(a.err_rate, "%.2f");
+            md.append(String.format(Locale.US, MD_ENDPOINT_ROW, label, avgCell, p95Cell, a.count, errCell));
+            html.append(String.format(Locale.US, HTML_ENDPOINT_ROW,
+                    escapeHtml(label), escapeHtml(avgCell), escapeHtml(p95Cell), a.count, escapeHtml(errCell)));
             Map<String,Object> je = new LinkedHashMap<>();
             je.put("avg_ms", numOrNull(a.avg_ms));
             je.put("p95_ms", numOrNull(a.p95_ms));
@@ -233,14 +258,11 @@ public class SummarizeAndCompare {
             html.append("</tbody></table>\n");
         }
 
-        String badgeColor = "#4c1";
-        String badgeText = "OK";
-        if ("yellow".equals(worstLevel)) { badgeColor = "#dfb317"; badgeText = "WARN"; }
-        else if ("red".equals(worstLevel)) { badgeColor = "#e05d44"; badgeText = "ALERT"; }
-        makeBadge(badgeColor, badgeText);
+        String badgeText = BADGE_TEXTS[worstLevel];
+        makeBadge(BADGE_COLORS[worstLevel], badgeText);
 
         Map<String, Object> overall = new LinkedHashMap<>();
-        overall.put("level", worstLevel);
+        overall.put("level", LEVEL_NAMES[worstLevel]);
         overall.put("badge", badgeText);
         json.put("scenarios", jsonScenarios);
         json.put("overall", overall);
@@ -251,22 +273,24 @@ public class SummarizeAndCompare {
         writeString(SUMMARY_MD, md.append('\n').toString());
         writeString(SUMMARY_HTML, html.toString());
 
-        // Append to history
-        List<String> toAppend = new ArrayList<>();
+        // Append to history (header only when the file is created) through a single buffered writer
         String header = "timestamp,run,commit,branch,scenario,avg_ms,p95_ms,throughput,err_rate";
-        if (!Files.exists(HISTORY_FILE)) {
-            ensureDir(HISTORY_DIR);
-            writeString(HISTORY_FILE, header + System.lineSeparator());
-        }
-        for (var e : scenarios.entrySet()) {
-            Agg a = e.getValue();
-            String line = String.format(Locale.US,
-                    "%s,%s,%s,%s,%s,%.3f,%.3f,%.5f,%.3f",
-                    NOW_ISO, RUN_NUMBER, SHA, BRANCH, e.getKey(), a.avg_ms, a.p95_ms, a.throughput, a.err_rate);
-            toAppend.add(line);
+        ensureDir(HISTORY_DIR);
+        boolean newHistory = !Files.exists(HISTORY_FILE);
+        try (BufferedWriter w = new BufferedWriter(new OutputStreamWriter(Files.newOutputStream(HISTORY_FILE,
+                StandardOpenOption.CREATE, StandardOpenOption.APPEND), StandardCharsets.UTF_8), 1 << 20)) {
+            if (newHistory) {
+                w.write(header);
+                w.write(System.lineSeparator());
+            }
+            for (var e : scenarios.entrySet()) {
+                Agg a = e.getValue();
+                w.write(HISTORY_ROW_PREFIX);
+                w.write(String.format(Locale.US, "%s,%.3f,%.3f,%.5f,%.3f",
+                        e.getKey(), a.avg_ms, a.p95_ms, a.throughput, a.err_rate));
+                w.write(System.lineSeparator());
+            }
         }
-        Files.write(HISTORY_FILE, (String.join(System.lineSeparator(), toAppend) + System.lineSeparator()).getBytes(StandardCharsets.UTF_8),
-                StandardOpenOption.APPEND);
 
         // Compact line for logs
         Map<String, Object> compact = new LinkedHashMap<>();
@@ -286,12 +310,11 @@ public class SummarizeAndCompare {
         System.exit(shouldBlock ? 2 : 0);
     }
 
-    static String worseOf(String a, String b) {
-        if (a.equals(b)) return a;
-        // red > yellow > green
-        if ("red".equals(a) || "red".equals(b)) return "red";
-        if ("yellow".equals(a) || "yellow".equals(b)) return "yellow";
-        return "green";
+    // Index of the regression band for a p95 delta (like numpy.digitize over DELTA_BOUNDS)
+    static int deltaBand(double delta) {
+        int band = 0;
+        while (band < DELTA_BOUNDS.length && delta > DELTA_BOUNDS[band]) band++;
+        return band;
     }
 
     static void ensureDirs() throws IOException {
@@ -325,35 +348,176 @@ public class SummarizeAndCompare {
         return raw;
     }
 
-    static class Sample { double elapsed; boolean success; String label; }
-
-    static List<Sample> readJMeterCsv(Path path) throws IOException {
-        List<Sample> out = new ArrayList<>();
-        try (BufferedReader br = Files.newBufferedReader(path, StandardCharsets.UTF_8)) {
-            String header = br.readLine();
-            if (header == null) return out;
-            String[] cols = Arrays.stream(header.split(",")).map(String::trim).toArray(String[]::new);
-            Map<String,Integer> idx = new HashMap<>();
-            for (int i = 0; i < cols.length; i++) idx.put(cols[i], i);
-            String line;
-            while ((line = br.readLine()) != null) {
-                if (line.isEmpty()) continue;
-                String[] parts = splitCsv(line, cols.length);
-                try {
-                    double elapsed = parseDouble(get(parts, idx, "elapsed"), get(parts, idx, "Elapsed"));
-                    String successStr = get(parts, idx, "success");
-                    if (successStr == null) successStr = get(parts, idx, "Success");
-                    boolean success = successStr != null && successStr.equalsIgnoreCase("true");
-                    String label = Optional.ofNullable(get(parts, idx, "label")).orElse(Optional.ofNullable(get(parts, idx, "Label")).orElse("unknown"));
-                    Sample s = new Sample();
-                    s.elapsed = elapsed; s.success = success; s.label = label;
-                    out.add(s);
-                } catch (Exception ignored) { }
+    /** Running totals for a scenario or endpoint; only elapsed times are retained (needed for p95). */
+    static class Samples {
+        float[] elapsed = new float[256];
+        int size, errors;
+        double sum;
+
+        void add(double e, boolean ok) {
+            if (size == elapsed.length) elapsed = Arrays.copyOf(elapsed, size * 2);
+            elapsed[size++] = (float) e;
+            sum += e;
+            if (!ok) errors++;
+        }
+
+        Samples addAll(Samples o) {
+            if (size + o.size > elapsed.length) elapsed = Arrays.copyOf(elapsed, Math.max(elapsed.length * 2, size + o.size));
+            System.arraycopy(o.elapsed, 0, elapsed, size, o.size);
+            size += o.size;
+            sum += o.sum;
+            errors += o.errors;
+            return this;
+        }
+    }
+
+    record ParsedCsv(Samples samples, Map<String, Samples> endpoints) { }
+
+    // Streams one CSV: rows are folded into the scenario totals and into the per-label endpoint totals.
+    // The file is memory-mapped and each row is scanned once over its raw bytes; only rows containing
+    // quotes are decoded to a String and handed to splitCsv.
+    static Samples readJMeterCsv(Path path, Map<String, Samples> endpoints) throws IOException {
+        Samples out = new Samples();
+        try (FileChannel ch = FileChannel.open(path, StandardOpenOption.READ); Arena arena = Arena.ofConfined()) {
+            long size = ch.size();
+            if (size == 0) return out;
+            MemorySegment seg = ch.map(FileChannel.MapMode.READ_ONLY, 0, size, arena);
+            long headerEnd = 0;
+            while (headerEnd < size && seg.get(JAVA_BYTE, headerEnd) != '\n') headerEnd++;
+            String header = decode(seg, 0, trimCr(seg, 0, headerEnd));
+            // Header case differs between JMeter versions (elapsed/Elapsed); resolve column indexes once
+            String[] cols = Arrays.stream(header.split(",")).map(c -> c.trim().toLowerCase(Locale.ROOT)).toArray(String[]::new);
+            List<String> colList = Arrays.asList(cols);
+            int elapsedIdx = colList.indexOf("elapsed");
+            int successIdx = colList.indexOf("success");
+            int labelIdx = colList.indexOf("label");
+            long pos = headerEnd + 1;
+            if (elapsedIdx < 0 && cols.length > 0 && isNumeric(cols[0])) {
+                // First line is already a sample (timeStamp first): no header, assume JMeter's default layout
+                elapsedIdx = DEFAULT_ELAPSED_IDX;
+                labelIdx = DEFAULT_LABEL_IDX;
+                successIdx = DEFAULT_SUCCESS_IDX;
+                pos = 0;
+            }
+            // [start, end) byte offsets of the columns up to the last one we need; -1 when the row is short
+            int needed = Math.max(elapsedIdx, Math.max(successIdx, labelIdx)) + 1;
+            long[] starts = new long[needed];
+            long[] ends = new long[needed];
+            LabelCache labels = new LabelCache();
+            while (pos < size) {
+                Arrays.fill(starts, -1);
+                int col = 0;
+                long fieldStart = pos, i = pos;
+                boolean quoted = false;
+                for (; i < size; i++) {
+                    byte b = seg.get(JAVA_BYTE, i);
+                    if (b == '\n') break;
+                    if (b == ',') {
+                        if (col < needed) { starts[col] = fieldStart; ends[col] = i; }
+                        col++;
+                        fieldStart = i + 1;
+                    } else if (b == '"') {
+                        quoted = true;
+                    }
+                }
+                long end = trimCr(seg, pos, i);
+                if (col < needed) { starts[col] = fieldStart; ends[col] = end; }
+                if (end > pos) {
+                    double elapsed;
+                    boolean success;
+                    Samples endpoint;
+                    if (!quoted) {
+                        elapsed = elapsedIdx < 0 ? 0.0 : parseElapsed(seg, starts[elapsedIdx], ends[elapsedIdx]);
+                        success = successIdx >= 0 && isTrue(seg, starts[successIdx], ends[successIdx]);
+                        if (labelIdx >= 0 && starts[labelIdx] >= 0) {
+                            endpoint = labels.endpoint(seg, starts[labelIdx], ends[labelIdx], endpoints);
+                        } else {
+                            endpoint = endpoints.computeIfAbsent(labelIdx < 0 ? "unknown" : "", k -> new Samples());
+                        }
+                    } else {
+                        String[] parts = splitCsv(decode(seg, pos, end), needed);
+                        elapsed = parseElapsed(get(parts, elapsedIdx));
+                        String successStr = get(parts, successIdx);
+                        success = successStr != null && successStr.equalsIgnoreCase("true");
+                        String label = Optional.ofNullable(get(parts, labelIdx)).orElse("unknown");
+                        endpoint = endpoints.computeIfAbsent(label, k -> new Samples());
+                    }
+                    out.add(elapsed, success);
+                    endpoint.add(elapsed, success);
+                }
+                pos = i + 1;
             }
         }
         return out;
     }
 
+    /**
+     * Maps raw label bytes to their endpoint totals. JMeter runs have a handful of distinct labels across
+     * millions of rows, so each label is decoded (and its String allocated) once per file instead of per row.
+     */
+    static final class LabelCache {
+        static final int MAX_ENTRIES = 64;
+        final MemorySegment[] keys = new MemorySegment[MAX_ENTRIES];
+        final Samples[] values = new Samples[MAX_ENTRIES];
+        int size, last;
+
+        Samples endpoint(MemorySegment seg, long from, long to, Map<String, Samples> endpoints) {
+            // Consecutive rows usually share a label, so try the previous hit first
+            if (size > 0 && matches(last, seg, from, to)) return values[last];
+            for (int k = 0; k < size; k++) {
+                if (matches(k, seg, from, to)) { last = k; return values[k]; }
+            }
+            byte[] raw = seg.asSlice(from, to - from).toArray(JAVA_BYTE);
+            Samples s = endpoints.computeIfAbsent(new String(raw, StandardCharsets.UTF_8), l -> new Samples());
+            // Past the cap (e.g. per-URL labels) just fall back to the map lookup
+            if (size < MAX_ENTRIES) {
+                keys[size] = MemorySegment.ofArray(raw);
+                values[size] = s;
+                last = size++;
+            }
+            return s;
+        }
+
+        boolean matches(int k, MemorySegment seg, long from, long to) {
+            MemorySegment key = keys[k];
+            return key.byteSize() == to - from && MemorySegment.mismatch(key, 0, key.byteSize(), seg, from, to) == -1;
+        }
+    }
+
+    static boolean isNumeric(String s) {
+        return !s.isEmpty() && s.chars().allMatch(ch -> ch >= '0' && ch <= '9');
+    }
+
+    static long trimCr(MemorySegment seg, long from, long to) {
+        return (to > from && seg.get(JAVA_BYTE, to - 1) == '\r') ? to - 1 : to;
+    }
+
+    static String decode(MemorySegment seg, long from, long to) {
+        return new String(seg.asSlice(from, to - from).toArray(JAVA_BYTE), StandardCharsets.UTF_8);
+    }
+
+    // Same as parseElapsed(String) but reads the digits straight from the mapped bytes
+    static double parseElapsed(MemorySegment seg, long from, long to) {
+        if (from < 0) return 0.0;
+        if (from == to || to - from > 18) return parseElapsed(decode(seg, from, to));
+        long v = 0;
+        for (long i = from; i < to; i++) {
+            byte b = seg.get(JAVA_BYTE, i);
+            if (b < '0' || b > '9') return parseElapsed(decode(seg, from, to));
+            v = v * 10 + (b - '0');
+        }
+        return v;
+    }
+
+    // Case-insensitive match of the field bytes against "true"
+    static boolean isTrue(MemorySegment seg, long from, long to) {
+        if (from < 0 || to - from != 4) return false;
+        for (int k = 0; k < 4; k++) {
+            if ((seg.get(JAVA_BYTE, from + k) | 0x20) != "true".charAt(k)) return false;
+        }
+        return true;
+    }
+
     // Basic CSV splitting that handles simple quoted fields; adequate for JMeter outputs
     static String[] splitCsv(String line, int expected) {
         List<String> res = new ArrayList<>();
@@ -374,110 +538,143 @@ public class SummarizeAndCompare {
         return res.toArray(new String[0]);
     }
 
-    static String get(String[] parts, Map<String,Integer> idx, String key) {
-        Integer i = idx.get(key);
-        if (i == null || i < 0 || i >= parts.length) return null;
+    // Returns the i-th field of an unquoted CSV line without splitting the rest; "" when the row is short
+    static String field(String line, int i) {
+        if (i < 0) return null;
+        int start = 0;
+        for (int n = 0; n < i; n++) {
+            start = line.indexOf(',', start) + 1;
+            if (start == 0) return "";
+        }
+        int end = line.indexOf(',', start);
+        return line.substring(start, end < 0 ? line.length() : end);
+    }
+
+    static String get(String[] parts, int i) {
+        if (i < 0 || i >= parts.length) return null;
         return parts[i];
     }
 
-    static double parseDouble(String... opts) {
-        for (String s : opts) {
-            if (s == null || s.isEmpty()) continue;
-            try { return Double.parseDouble(s); } catch (Exception ignored) {}
+    // JMeter writes elapsed as whole milliseconds: accumulate plain digits directly and only fall back
+    // to Double.parseDouble for anything else (decimals, whitespace, signs)
+    static double parseElapsed(String s) {
+        if (s == null || s.isEmpty()) return 0.0;
+        int n = s.length();
+        if (n <= 18) {
+            long v = 0;
+            int i = 0;
+            for (; i < n; i++) {
+                char ch = s.charAt(i);
+                if (ch < '0' || ch > '9') break;
+                v = v * 10 + (ch - '0');
+            }
+            if (i == n) return v;
         }
-        return 0.0;
+        try { return Double.parseDouble(s); } catch (NumberFormatException ignored) { return 0.0; }
     }
 
     static class Agg { double avg_ms, p95_ms, throughput, err_rate; int count, errors, success; }
 
-    static Agg aggregate(List<Sample> samples) {
+    static Agg aggregate(Samples samples) {
         Agg a = new Agg();
-        if (samples.isEmpty()) { a.avg_ms = Double.NaN; a.p95_ms = Double.NaN; return a; }
-        double[] el = samples.stream().mapToDouble(s -> s.elapsed).toArray();
-        a.count = el.length;
-        a.avg_ms = Arrays.stream(el).average().orElse(Double.NaN);
-        a.p95_ms = percentile(el, 95);
-        a.errors = (int) samples.stream().filter(s -> !s.success).count();
+        if (samples.size == 0) { a.avg_ms = Double.NaN; a.p95_ms = Double.NaN; return a; }
+        a.count = samples.size;
+        a.errors = samples.errors;
+        a.avg_ms = samples.sum / a.count;
+        a.p95_ms = percentile(samples.elapsed, samples.size, 95);
         a.success = a.count - a.errors;
-        double totalElapsedSec = Arrays.stream(el).sum() / 1000.0;
+        double totalElapsedSec = samples.sum / 1000.0;
         a.throughput = totalElapsedSec > 0 ? a.count / totalElapsedSec : 0.0;
         a.err_rate = a.count > 0 ? (a.errors * 100.0) / a.count : 0.0;
         return a;
     }
 
-    static double percentile(double[] values, double p) {
-        if (values.length == 0) return Double.NaN;
-        double[] v = Arrays.copyOf(values, values.length);
-        Arrays.sort(v);
-        double k = (v.length - 1) * (p / 100.0);
+    // Linear-interpolated percentile over the first n values. Partitions the array in place (element
+    // order is not meaningful to callers), so no copy and no full sort is needed.
+    static double percentile(float[] v, int n, double p) {
+        if (n == 0) return Double.NaN;
+        double k = (n - 1) * (p / 100.0);
         int f = (int) Math.floor(k);
         int c = (int) Math.ceil(k);
-        if (f == c) return v[f];
-        double d0 = v[f] * (c - k);
-        double d1 = v[c] * (k - f);
-        return d0 + d1;
+        double lo = select(v, n, f);
+        if (f == c) return lo;
+        // After selecting rank f everything above it is >= v[f], so rank c = f + 1 is just the minimum there
+        float hi = v[c];
+        for (int i = c + 1; i < n; i++) {
+            if (v[i] < hi) hi = v[i];
+        }
+        return lo * (c - k) + hi * (k - f);
     }
 
-    static List<HistRow> readHistory() throws IOException {
-        List<HistRow> hist = new ArrayList<>();
-        if (!Files.exists(HISTORY_FILE)) return hist;
-        try (BufferedReader br = Files.newBufferedReader(HISTORY_FILE, StandardCharsets.UTF_8)) {
-            String header = br.readLine();
-            if (header == null) return hist;
-            String line;
-            while ((line = br.readLine()) != null) {
-                if (line.isEmpty()) continue;
-                String[] parts = line.split(",", -1);
-                try {
-                    HistRow h = new HistRow();
-                    h.timestamp = parts[0];
-                    h.run = parts.length > 1 ? parts[1] : "";
-                    h.commit = parts.length > 2 ? parts[2] : "";
-                    h.branch = parts.length > 3 ? parts[3] : "";
-                    h.scenario = parts.length > 4 ? parts[4] : "";
-                    h.avg_ms = parts.length > 5 ? Double.parseDouble(parts[5]) : Double.NaN;
-                    h.p95_ms = parts.length > 6 ? Double.parseDouble(parts[6]) : Double.NaN;
-                    h.throughput = parts.length > 7 ? Double.parseDouble(parts[7]) : 0.0;
-                    h.err_rate = parts.length > 8 ? Double.parseDouble(parts[8]) : 0.0;
-                    hist.add(h);
-                } catch (Exception ignored) { }
+    // Quickselect: reorders v[0..n) in place so that v[k] is the k-th smallest value (expected O(n))
+    static double select(float[] v, int n, int k) {
+        int left = 0, right = n - 1;
+        while (left < right) {
+            float pivot = v[(left + right) >>> 1];
+            int i = left, j = right;
+            while (i <= j) {
+                while (v[i] < pivot) i++;
+                while (v[j] > pivot) j--;
+                if (i <= j) { float t = v[i]; v[i] = v[j]; v[j] = t; i++; j--; }
             }
+            if (k <= j) right = j;
+            else if (k >= i) left = i;
+            else return v[k];
         }
-        return hist;
+        return v[k];
     }
 
-    static class HistRow {
-        String timestamp, run, commit, branch, scenario; double avg_ms, p95_ms, throughput, err_rate;
+    // Streams the history file keeping only the last `window` valid p95 values per scenario, so memory
+    // stays bounded as history grows, and returns the moving-average baseline of each scenario
+    static Map<String, Double> readBaselines(int window) throws IOException {
+        Map<String, ArrayDeque<Double>> recent = new HashMap<>();
+        if (Files.exists(HISTORY_FILE)) {
+            try (BufferedReader br = Files.newBufferedReader(HISTORY_FILE, StandardCharsets.UTF_8)) {
+                br.readLine(); // header
+                String line;
+                while ((line = br.readLine()) != null) {
+                    if (line.isEmpty()) continue;
+                    // Only scenario (col 4) and p95_ms (col 6) feed the baseline
+                    try {
+                        double p95 = Double.parseDouble(field(line, 6));
+                        if (Double.isNaN(p95) || p95 <= 0) continue;
+                        ArrayDeque<Double> last = recent.computeIfAbsent(field(line, 4), k -> new ArrayDeque<>(window));
+                        if (last.size() == window) last.removeFirst();
+                        last.addLast(p95);
+                    } catch (NumberFormatException ignored) { }
+                }
+            }
+        }
+        Map<String, Double> baselines = new HashMap<>();
+        for (var e : recent.entrySet()) {
+            baselines.put(e.getKey(), e.getValue().stream().mapToDouble(Double::doubleValue).average().orElse(Double.NaN));
+        }
+        return baselines;
     }
 
-    static double movingAverage(List<Double> values, int window) {
-        if (values == null || values.isEmpty()) return Double.NaN;
-        int from = Math.max(0, values.size() - window);
-        List<Double> sub = values.subList(from, values.size());
-        return sub.stream().mapToDouble(Double::doubleValue).average().orElse(Double.NaN);
-    }
+    // Badge SVG with {color} and {label} placeholders
+    static final String BADGE_TEMPLATE = "" +
+            "<svg xmlns='http://www.w3.org/2000/svg' width='150' height='20'>\n" +
+            "  <linearGradient id='b' x2='0' y2='100%'>\n" +
+            "    <stop offset='0' stop-color='#bbb' stop-opacity='.1'/>\n" +
+            "    <stop offset='1' stop-opacity='.1'/>\n" +
+            "  </linearGradient>\n" +
+            "  <mask id='a'>\n" +
+            "    <rect width='150' height='20' rx='3' fill='#fff'/>\n" +
+            "  </mask>\n" +
+            "  <g mask='url(#a)'>\n" +
+            "    <rect width='80' height='20' fill='#555'/>\n" +
+            "    <rect x='80' width='70' height='20' fill='{color}'/>\n" +
+            "    <rect width='150' height='20' fill='url(#b)'/>\n" +
+            "  </g>\n" +
+            "  <g fill='#fff' text-anchor='middle' font-family='Verdana,Geneva,DejaVu Sans,sans-serif' font-size='11'>\n" +
+            "    <text x='40' y='14'>Perf</text>\n" +
+            "    <text x='115' y='14'>{label}</text>\n" +
+            "  </g>\n" +
+            "</svg>\n";
 
     static void makeBadge(String color, String label) throws IOException {
-        String svg = "" +
-                "<svg xmlns='http://www.w3.org/2000/svg' width='150' height='20'>\n" +
-                "  <linearGradient id='b' x2='0' y2='100%'>\n" +
-                "    <stop offset='0' stop-color='#bbb' stop-opacity='.1'/>\n" +
-                "    <stop offset='1' stop-opacity='.1'/>\n" +
-                "  </linearGradient>\n" +
-                "  <mask id='a'>\n" +
-                "    <rect width='150' height='20' rx='3' fill='#fff'/>\n" +
-                "  </mask>\n" +
-                "  <g mask='url(#a)'>\n" +
-                "    <rect width='80' height='20' fill='#555'/>\n" +
-                "    <rect x='80' width='70' height='20' fill='" + color + "'/>\n" +
-                "    <rect width='150' height='20' fill='url(#b)'/>\n" +
-                "  </g>\n" +
-                "  <g fill='#fff' text-anchor='middle' font-family='Verdana,Geneva,DejaVu Sans,sans-serif' font-size='11'>\n" +
-                "    <text x='40' y='14'>Perf</text>\n" +
-                "    <text x='115' y='14'>" + label + "</text>\n" +
-                "  </g>\n" +
-                "</svg>\n";
-        writeString(BADGE_SVG, svg);
+        writeString(BADGE_SVG, BADGE_TEMPLATE.replace("{color}", color).replace("{label}", label));
     }
 
     static void writeString(Path path, String content) throws IOException {
@@ -485,22 +682,63 @@ public class SummarizeAndCompare {
         Files.write(path, content.getBytes(StandardCharsets.UTF_8));
     }
 
-    // Minimal JSON serialization for our nested Maps/Lists/primitives
+    // Minimal JSON serialization for our nested Maps/Lists/primitives, written into one builder
     static String toJson(Object o) {
-        if (o == null) return "null";
-        if (o instanceof String s) return '"' + escape(s) + '"';
-        if (o instanceof Number || o instanceof Boolean) return String.valueOf(o);
-        if (o instanceof Map<?,?> m) {
-            return "{" + m.entrySet().stream().map(e -> toJson(String.valueOf(e.getKey())) + ":" + toJson(e.getValue())).collect(Collectors.joining(",")) + "}";
-        }
-        if (o instanceof Collection<?> c) {
-            return "[" + c.stream().map(SummarizeAndCompare::toJson).collect(Collectors.joining(",")) + "]";
+        StringBuilder sb = new StringBuilder(1024);
+        writeJson(sb, o);
+        return sb.toString();
+    }
+
+    static void writeJson(StringBuilder sb, Object o) {
+        if (o == null) {
+            sb.append("null");
+        } else if (o instanceof String s) {
+            escape(sb, s);
+        } else if (o instanceof Number || o instanceof Boolean) {
+            sb.append(o);
+        } else if (o instanceof Map<?,?> m) {
+            sb.append('{');
+            boolean first = true;
+            for (var e : m.entrySet()) {
+                if (!first) sb.append(',');
+                first = false;
+                escape(sb, String.valueOf(e.getKey()));
+                sb.append(':');
+                writeJson(sb, e.getValue());
+            }
+            sb.append('}');
+        } else if (o instanceof Collection<?> c) {
+            sb.append('[');
+            boolean first = true;
+            for (Object v : c) {
+                if (!first) sb.append(',');
+                first = false;
+                writeJson(sb, v);
+            }
+            sb.append(']');
+        } else {
+            escape(sb, String.valueOf(o));
         }
-        return '"' + escape(String.valueOf(o)) + '"';
     }
 
-    static String escape(String s) {
-        return s.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n").replace("\r", "\\r");
+    // Appends s as a quoted JSON string
+    static void escape(StringBuilder sb, String s) {
+        sb.append('"');
+        for (int i = 0; i < s.length(); i++) {
+            char ch = s.charAt(i);
+            switch (ch) {
+                case '\\' -> sb.append("\\\\");
+                case '"' -> sb.append("\\\"");
+                case '\n' -> sb.append("\\n");
+                case '\r' -> sb.append("\\r");
+                case '\t' -> sb.append("\\t");
+                default -> {
+                    if (ch < 0x20) sb.append(String.format("\\u%04x", (int) ch));
+                    else sb.append(ch);
+                }
+            }
+        }
+        sb.append('"');
     }
 
     static String escapeHtml(String s) {